@@ -1,19 +1,40 @@
 import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 import time
 from datetime import datetime
 import csv
+import re
 
 # Configure settings
 BASE_URL = "https://ncpulblog.blogspot.com/2022/"
 OUTPUT_FOLDER = "ncpul_articles"
 DELAY_BETWEEN_REQUESTS = 2  # seconds
+REQUEST_TIMEOUT = 15  # seconds
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Anything other than word characters, space, dot, underscore or hyphen
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w .\-]')
+CSV_BUFFER_SIZE = 1 << 20  # Metadata CSV write buffer
+
+# Only build post divs and the pager link (regex so "post hentry" matches)
+PAGE_STRAINER = SoupStrainer(['div', 'a'], class_=re.compile(r'(?:^|\s)(?:post|blog-pager-older-link)(?:\s|$)'))
+
+# One pooled keep-alive session for every request, retrying transient errors.
+# requests already advertises gzip/deflate and decompresses responses.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 def setup_folders():
     """Create necessary folders for output"""
     if not os.path.exists(OUTPUT_FOLDER):
@@ -22,8 +43,13 @@ def setup_folders():
 
 def sanitize_filename(title):
     """Create a safe filename from article title"""
-    keep_chars = (' ', '.', '_', '-')
-    return "".join(c if c.isalnum() or c in keep_chars else "_" for c in title).strip()
+    return UNSAFE_FILENAME_CHARS.sub('_', title).strip()
+
+def _tag_text(tag):
+    """Text of a tag; single text nodes are read directly without a subtree walk"""
+    if tag.string is not None:
+        return tag.string.strip()
+    return tag.get_text(' ', strip=True)
 
 def extract_article_data(article_div):
     """Extract relevant data from article HTML"""
@@ -32,7 +58,7 @@ def extract_article_data(article_div):
     # Title and URL
     title_tag = article_div.find('h3', class_='post-title')
     if title_tag:
-        data['title'] = title_tag.get_text(strip=True)
+        data['title'] = _tag_text(title_tag)
         link = title_tag.find('a')
         if link:
             data['url'] = link['href']
@@ -40,17 +66,17 @@ def extract_article_data(article_div):
     # Date
     date_tag = article_div.find('span', class_='post-timestamp')
     if date_tag:
-        data['date'] = date_tag.get_text(strip=True)
+        data['date'] = _tag_text(date_tag)
     
     # Author
     author_tag = article_div.find('span', class_='post-author')
     if author_tag:
-        data['author'] = author_tag.get_text(strip=True)
+        data['author'] = _tag_text(author_tag)
     
     # Content
     content_div = article_div.find('div', class_='post-body')
     if content_div:
-        data['content'] = content_div.get_text(strip=True)
+        data['content'] = _tag_text(content_div)
     
     return data
 
@@ -91,9 +117,9 @@ def scrape_articles(start_url, max_pages=5):
         
         try:
             # Fetch page
-            response = requests.get(current_url, headers=HEADERS)
+            response = SESSION.get(current_url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=PAGE_STRAINER)
             
             # Find all articles
             articles = soup.find_all('div', class_='post')
@@ -134,7 +160,7 @@ def save_to_csv(articles, folder_path):
     csv_path = os.path.join(folder_path, 'articles_metadata.csv')
     fieldnames = ['title', 'date', 'author', 'url', 'file_path']
     
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(articles)
@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import aiohttp
+
+# Connection pool settings shared by all scrapers
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 10
+MAX_CONCURRENT_REQUESTS = 15
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10)
+
+# Politeness settings (applied per host)
+REQUESTS_PER_SECOND = 5
+BURST_SIZE = 10
+MAX_RETRIES = 5
+MAX_BACKOFF = 60  # seconds
+RETRY_STATUSES = (429, 503)
+
+_session = None
+_semaphore = None
+_limiter = None
+
+def _parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimiter:
+    """Token bucket rate limiter keyed by host"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST_SIZE):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}  # host -> (tokens, last refill time)
+        self._paused_until = {}
+        self._lock = asyncio.Lock()
+
+    def _refill(self, host, now):
+        tokens, last = self._buckets.get(host, (self.burst, now))
+        return min(self.burst, tokens + (now - last) * self.rate)
+
+    async def acquire(self, host):
+        """Wait until a request to host is allowed"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                tokens = self._refill(host, now)
+                wait = self._paused_until.get(host, 0) - now
+                if wait <= 0 and tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                if wait <= 0:
+                    wait = (1 - tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, host, seconds):
+        """Hold back all requests to host for the given number of seconds"""
+        now = time.monotonic()
+        self._paused_until[host] = max(self._paused_until.get(host, 0), now + seconds)
+        self._buckets[host] = (0, now)
+
+    def update_from_headers(self, host, headers):
+        """Adjust the bucket from Retry-After / X-RateLimit-Remaining headers"""
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            self.pause(host, retry_after)
+            return retry_after
+        if headers.get('X-RateLimit-Remaining', '').strip() == '0':
+            self._buckets[host] = (0, time.monotonic())
+        return None
+
+def get_session():
+    """Return the shared aiohttp session, creating it on first use"""
+    global _session, _semaphore, _limiter
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONNECTIONS,
+            limit_per_host=MAX_CONNECTIONS_PER_HOST
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _limiter = RateLimiter()
+    return _session
+
+async def close_session():
+    """Close the shared session and release its connections"""
+    global _session, _semaphore, _limiter
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _semaphore = None
+    _limiter = None
+
+async def fetch_page(url, headers=None):
+    """Fetch a page through the shared session and return its raw bytes
+
+    Requests are rate limited per host and retried with exponential
+    backoff when the server answers 429 or 503.
+    """
+    session = get_session()
+    host = urlparse(url).netloc
+
+    for attempt in range(MAX_RETRIES + 1):
+        await _limiter.acquire(host)
+        async with _semaphore:
+            async with session.get(url, headers=headers) as resp:
+                retry_after = _limiter.update_from_headers(host, resp.headers)
+                if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    resp.raise_for_status()
+                    return await resp.read()
+
+        # Retry-After already paused the host in the limiter
+        delay = 0 if retry_after is not None else min(2 ** attempt, MAX_BACKOFF) + random.random()
+        print(f"  HTTP {resp.status} from {host}, retrying ({attempt + 1}/{MAX_RETRIES})")
+        await asyncio.sleep(delay)
@@ -1,15 +1,65 @@
 import os
 import pandas as pd
-from transformers import pipeline, AutoTokenizer
+import torch
+from transformers import (
+    pipeline,
+    AutoTokenizer,
+    AutoModelForSequenceClassification,
+    AutoModelForSeq2SeqLM
+)
 import warnings
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Disable all warnings
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 warnings.filterwarnings('ignore')
 
+# Substring rules mapping model labels to Urdu categories, checked in order
+CATEGORY_RULES = (
+    ('sport', 'کھیل'),
+    ('tech', 'ٹیکنالوجی'),
+    ('polit', 'سیاست'),
+    ('health', 'صحت'),
+    ('science', 'سائنس'),
+    ('world', 'عالمی'),
+    ('art', 'فن و ثقافت'),
+    ('culture', 'فن و ثقافت'),
+    ('business', 'کاروبار'),
+)
+
+# Urdu keywords that settle the category without running the classifier
+CATEGORY_KEYWORDS = {
+    'کھیل': ['کرکٹ', 'فٹبال', 'ہاکی', 'میچ', 'کھلاڑی', 'ٹورنامنٹ', 'اولمپک'],
+    'سیاست': ['حکومت', 'انتخابات', 'وزیراعظم', 'وزیر اعظم', 'پارلیمنٹ', 'اسمبلی', 'سیاسی'],
+    'صحت': ['ہسپتال', 'بیماری', 'ڈاکٹر', 'علاج', 'مریض', 'ویکسین'],
+    'سائنس': ['سائنس', 'سائنسی', 'سائنسدان', 'تحقیق'],
+    'ٹیکنالوجی': ['ٹیکنالوجی', 'کمپیوٹر', 'انٹرنیٹ', 'موبائل', 'سافٹ ویئر'],
+    'کاروبار': ['کاروبار', 'معیشت', 'اسٹاک', 'سرمایہ', 'بینک', 'تجارت'],
+    'فن و ثقافت': ['فلم', 'موسیقی', 'ثقافت', 'شاعری', 'فنکار', 'اداکار'],
+    'عالمی': ['بین الاقوامی', 'اقوام متحدہ', 'عالمی'],
+}
+CATEGORY_PATTERNS = {
+    category: re.compile('|'.join(map(re.escape, terms)))
+    for category, terms in CATEGORY_KEYWORDS.items()
+}
+KEYWORD_SCAN_CHARS = 2048
+
+# Write buffer for the results CSV
+CSV_BUFFER_SIZE = 1 << 20
+
+# Result columns; the category columns repeat a handful of labels and are stored as categoricals
+RESULT_COLUMNS = ['file_name', 'file_path', 'category_urdu', 'category_english',
+                  'summary', 'text_length', 'text_sample']
+CATEGORY_COLUMNS = ['category_urdu', 'category_english']
+
+# Paragraph breaks, and sentence ends including the Urdu full stop (۔) and question mark (؟)
+PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+SENTENCE_SPLIT = re.compile(r'(?<=[۔؟!?.])\s+')
+
 class UrduLLMProcessor:
     def __init__(self):
         # Configuration
@@ -37,6 +87,17 @@ class UrduLLMProcessor:
         self.MAX_SUMMARY_LENGTH = 120
         self.MIN_CHUNK_LENGTH = 150
         
+        # Batch sizes for pipeline calls
+        self.FILE_BATCH_SIZE = 64
+        self.CLASSIFICATION_BATCH_SIZE = 16
+        self.SUMMARIZATION_BATCH_SIZE = 8
+        
+        # Worker processes for process_files, each holding its own model replica
+        self.NUM_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+        
+        # Dynamic int8 quantization of Linear layers for CPU inference
+        self.QUANTIZE_MODELS = True
+        
         # Initialize models
         self.classifier = None
         self.summarizer = None
@@ -46,12 +107,25 @@ class UrduLLMProcessor:
         """Load pre-trained models with error handling"""
         try:
             # Initialize tokenizer first
-            self.tokenizer = AutoTokenizer.from_pretrained("distilbert-base-multilingual-cased")
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                "distilbert-base-multilingual-cased",
+                use_fast=True
+            )
+            
+            classifier_model = AutoModelForSequenceClassification.from_pretrained(
+                "distilbert-base-multilingual-cased"
+            )
+            summarizer_model = AutoModelForSeq2SeqLM.from_pretrained(
+                "sshleifer/distilbart-cnn-12-6"
+            )
+            if self.QUANTIZE_MODELS:
+                classifier_model = self._quantize_model(classifier_model)
+                summarizer_model = self._quantize_model(summarizer_model)
             
             # For classification
             self.classifier = pipeline(
                 "text-classification",
-                model="distilbert-base-multilingual-cased",
+                model=classifier_model,
                 device=-1,
                 tokenizer=self.tokenizer
             )
@@ -59,7 +133,7 @@ class UrduLLMProcessor:
             # For summarization
             self.summarizer = pipeline(
                 "summarization",
-                model="sshleifer/distilbart-cnn-12-6",
+                model=summarizer_model,
                 device=-1,
                 tokenizer="sshleifer/distilbart-cnn-12-6"
             )
@@ -70,119 +144,138 @@ class UrduLLMProcessor:
             print(f"Error loading models: {e}")
             return False
 
+    def _quantize_model(self, model):
+        """Convert Linear layers to int8 for faster, smaller CPU inference"""
+        model.eval()
+        return torch.ao.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+    
     def _map_to_urdu_category(self, label):
         """Map model output to Urdu categories"""
         label = str(label).lower()
-        if 'sport' in label:
-            return 'کھیل'
-        elif 'tech' in label:
-            return 'ٹیکنالوجی'
-        elif 'polit' in label:
-            return 'سیاست'
-        elif 'health' in label:
-            return 'صحت'
-        elif 'science' in label:
-            return 'سائنس'
-        elif 'world' in label:
-            return 'عالمی'
-        elif 'art' in label or 'culture' in label:
-            return 'فن و ثقافت'
-        elif 'business' in label:
-            return 'کاروبار'
-        else:
-            return 'دیگر'
+        for needle, category in CATEGORY_RULES:
+            if needle in label:
+                return category
+        return 'دیگر'
+    
+    def _count_tokens(self, texts):
+        """Count tokens for a list of text spans in a single tokenizer call"""
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_length=True,
+            verbose=False
+        )
+        return encoded['length']
     
     def _truncate_text_to_tokens(self, text, max_tokens):
         """Safely truncate text to specified number of tokens"""
-        tokens = self.tokenizer.tokenize(text)
-        if len(tokens) <= max_tokens:
+        token_ids = self.tokenizer(text, add_special_tokens=False, verbose=False)['input_ids']
+        if len(token_ids) <= max_tokens:
             return text
         
-        truncated_tokens = tokens[:max_tokens]
-        return self.tokenizer.convert_tokens_to_string(truncated_tokens)
+        return self.tokenizer.decode(token_ids[:max_tokens])
     
-    def classify_text(self, text):
-        """Classify Urdu text with robust error handling"""
+    def _keyword_category(self, text):
+        """Return the category whose keywords clearly dominate the opening text, if any"""
+        head = text[:KEYWORD_SCAN_CHARS]
+        counts = {category: len(pattern.findall(head))
+                  for category, pattern in CATEGORY_PATTERNS.items()}
+        best = max(counts, key=counts.get)
+        top = counts[best]
+        if top == 0 or list(counts.values()).count(top) > 1:
+            return None
+        return best
+    
+    def classify_texts(self, texts):
+        """Classify a batch of Urdu texts, using the model only when keywords are ambiguous"""
         if not self.classifier:
             raise ValueError("Classifier not initialized")
         
+        categories = [self._keyword_category(text) for text in texts]
+        pending = [i for i, category in enumerate(categories) if category is None]
+        if pending:
+            model_categories = self._classify_with_model([texts[i] for i in pending])
+            for i, category in zip(pending, model_categories):
+                categories[i] = category
+        return categories
+    
+    def _classify_with_model(self, texts):
+        """Classify a batch of texts with a single pipeline call"""
+        safe_texts = [self._truncate_text_to_tokens(text, self.MAX_CLASSIFICATION_TOKENS)
+                      for text in texts]
         try:
-            safe_text = self._truncate_text_to_tokens(text, self.MAX_CLASSIFICATION_TOKENS)
-            result = self.classifier(safe_text)
-            return self._map_to_urdu_category(result[0]['label'])
+            results = self.classifier(
+                safe_texts,
+                batch_size=self.CLASSIFICATION_BATCH_SIZE,
+                truncation=True,
+                max_length=self.MAX_CLASSIFICATION_TOKENS
+            )
+            return [self._map_to_urdu_category(result['label']) for result in results]
         except Exception as e:
-            print(f"Classification failed: {str(e)[:100]}...")
-            return "دیگر"
+            print(f"Batch classification failed: {str(e)[:100]}...")
+        
+        # Fall back to one text at a time so a single bad input doesn't sink the batch
+        categories = []
+        for safe_text in safe_texts:
+            try:
+                result = self.classifier(safe_text)
+                categories.append(self._map_to_urdu_category(result[0]['label']))
+            except Exception as e:
+                print(f"Classification failed: {str(e)[:100]}...")
+                categories.append("دیگر")
+        return categories
+    
+    def classify_text(self, text):
+        """Classify Urdu text with robust error handling"""
+        return self.classify_texts([text])[0]
     
     def _chunk_text_for_summarization(self, text):
-        """Special chunking for summarization that ensures meaningful chunks"""
-        paragraphs = re.split(r'\n\s*\n', text)
-        if len(paragraphs) > 1:
-            chunks = []
-            current_chunk = []
-            current_length = 0
-            
-            for para in paragraphs:
-                para_tokens = self.tokenizer.tokenize(para)
-                para_length = len(para_tokens)
-                
-                if para_length > self.MAX_SUMMARIZATION_TOKENS:
-                    sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', para)
-                    for sent in sentences:
-                        sent_tokens = self.tokenizer.tokenize(sent)
-                        sent_length = len(sent_tokens)
-                        
-                        if current_length + sent_length > self.MAX_SUMMARIZATION_TOKENS:
-                            if current_chunk:
-                                chunks.append(' '.join(current_chunk))
-                            current_chunk = [sent]
-                            current_length = sent_length
-                        else:
-                            current_chunk.append(sent)
-                            current_length += sent_length
-                else:
-                    if current_length + para_length > self.MAX_SUMMARIZATION_TOKENS:
-                        if current_chunk:
-                            chunks.append(' '.join(current_chunk))
-                        current_chunk = [para]
-                        current_length = para_length
-                    else:
-                        current_chunk.append(para)
-                        current_length += para_length
-            
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-            
-            return chunks
-        
-        sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
+        """Special chunking for summarization that ensures meaningful chunks
+
+        Returns (chunk_text, token_count) tuples so chunks are never re-tokenized.
+        """
         chunks = []
         current_chunk = []
         current_length = 0
         
-        for sent in sentences:
-            sent_tokens = self.tokenizer.tokenize(sent)
-            sent_length = len(sent_tokens)
-            
-            if current_length + sent_length > self.MAX_SUMMARIZATION_TOKENS:
+        def add_span(span, span_length):
+            nonlocal current_chunk, current_length
+            if current_length + span_length > self.MAX_SUMMARIZATION_TOKENS:
                 if current_chunk:
-                    chunks.append(' '.join(current_chunk))
-                current_chunk = [sent]
-                current_length = sent_length
+                    chunks.append((' '.join(current_chunk), current_length))
+                current_chunk = [span]
+                current_length = span_length
             else:
-                current_chunk.append(sent)
-                current_length += sent_length
+                current_chunk.append(span)
+                current_length += span_length
+        
+        paragraphs = PARAGRAPH_SPLIT.split(text)
+        if len(paragraphs) > 1:
+            for para, para_length in zip(paragraphs, self._count_tokens(paragraphs)):
+                if para_length > self.MAX_SUMMARIZATION_TOKENS:
+                    sentences = SENTENCE_SPLIT.split(para)
+                    for sent, sent_length in zip(sentences, self._count_tokens(sentences)):
+                        add_span(sent, sent_length)
+                else:
+                    add_span(para, para_length)
+        else:
+            sentences = SENTENCE_SPLIT.split(text)
+            for sent, sent_length in zip(sentences, self._count_tokens(sentences)):
+                add_span(sent, sent_length)
         
         if current_chunk:
-            chunks.append(' '.join(current_chunk))
+            chunks.append((' '.join(current_chunk), current_length))
         
         return chunks
     
-    def _safe_summarize(self, text, max_length, min_length):
-        """Wrapper for summarization with additional checks"""
-        tokens = self.tokenizer.tokenize(text)
-        token_count = len(tokens)
-        
+    def _summary_lengths(self, max_length, min_length, token_count):
+        """Clamp summary length limits to the input size, or None if too short"""
         if token_count < self.MIN_CHUNK_LENGTH:
             return None
         
@@ -192,6 +285,18 @@ class UrduLLMProcessor:
         if actual_min >= actual_max:
             actual_min = max(10, actual_max // 2)
         
+        return actual_max, actual_min
+    
+    def _safe_summarize(self, text, max_length, min_length, token_count=None):
+        """Wrapper for summarization with additional checks"""
+        if token_count is None:
+            token_count = self._count_tokens([text])[0]
+        
+        lengths = self._summary_lengths(max_length, min_length, token_count)
+        if lengths is None:
+            return None
+        actual_max, actual_min = lengths
+        
         try:
             summary = self.summarizer(
                 text,
@@ -205,99 +310,226 @@ class UrduLLMProcessor:
             print(f"Summarization skipped (safe mode): {str(e)[:100]}...")
             return None
     
-    def summarize_text(self, text):
-        """Generate summary with robust error handling"""
+    def _summarize_batch(self, jobs):
+        """Summarize (text, max_length, min_length, token_count) jobs in batches
+        
+        Jobs sharing the same clamped length limits go through the summarizer
+        together; results come back in job order.
+        """
+        summaries = [None] * len(jobs)
+        groups = {}
+        for index, (text, max_length, min_length, token_count) in enumerate(jobs):
+            lengths = self._summary_lengths(max_length, min_length, token_count)
+            if lengths is not None:
+                groups.setdefault(lengths, []).append(index)
+        
+        for (actual_max, actual_min), indices in groups.items():
+            try:
+                outputs = self.summarizer(
+                    [jobs[i][0] for i in indices],
+                    batch_size=self.SUMMARIZATION_BATCH_SIZE,
+                    max_length=actual_max,
+                    min_length=actual_min,
+                    do_sample=False,
+                    truncation=True
+                )
+                for i, output in zip(indices, outputs):
+                    summaries[i] = output['summary_text']
+            except Exception as e:
+                print(f"Batch summarization failed, retrying one by one: {str(e)[:100]}...")
+                for i in indices:
+                    summaries[i] = self._safe_summarize(*jobs[i])
+        
+        return summaries
+    
+    def summarize_texts(self, texts):
+        """Generate summaries for a batch of texts with robust error handling"""
         if not self.summarizer:
             raise ValueError("Summarizer not initialized")
         
-        tokens = self.tokenizer.tokenize(text)
-        if len(tokens) <= self.MAX_SUMMARIZATION_TOKENS:
-            summary = self._safe_summarize(
-                text,
-                self.MAX_SUMMARY_LENGTH,
-                self.MIN_SUMMARY_LENGTH
-            )
-            if summary:
-                return summary
-        
-        chunks = self._chunk_text_for_summarization(text)
-        valid_chunks = [chunk for chunk in chunks 
-                       if len(self.tokenizer.tokenize(chunk)) >= self.MIN_CHUNK_LENGTH]
-        
-        if not valid_chunks:
-            return "خلاصہ دستیاب نہیں (متن بہت چھوٹا ہے)"
-        
-        chunk_summaries = []
-        for chunk in valid_chunks:
-            chunk_summary = self._safe_summarize(
-                chunk,
-                self.MAX_SUMMARY_LENGTH // len(valid_chunks),
-                max(15, self.MIN_SUMMARY_LENGTH // len(valid_chunks))
-            )
+        summaries = [None] * len(texts)
+        
+        # Summarize texts that fit in the model in one go
+        whole = [(i, text, token_count)
+                 for i, (text, token_count) in enumerate(zip(texts, self._count_tokens(texts)))
+                 if token_count <= self.MAX_SUMMARIZATION_TOKENS]
+        whole_summaries = self._summarize_batch([
+            (text, self.MAX_SUMMARY_LENGTH, self.MIN_SUMMARY_LENGTH, token_count)
+            for _, text, token_count in whole
+        ])
+        for (i, _, _), summary in zip(whole, whole_summaries):
+            summaries[i] = summary
+        
+        # Chunk everything else and summarize all chunks together
+        jobs = []
+        owners = []
+        for i, text in enumerate(texts):
+            if summaries[i]:
+                continue
+            
+            chunks = self._chunk_text_for_summarization(text)
+            valid_chunks = [(chunk, length) for chunk, length in chunks
+                            if length >= self.MIN_CHUNK_LENGTH]
+            
+            if not valid_chunks:
+                summaries[i] = "خلاصہ دستیاب نہیں (متن بہت چھوٹا ہے)"
+                continue
+            
+            for chunk, length in valid_chunks:
+                jobs.append((
+                    chunk,
+                    self.MAX_SUMMARY_LENGTH // len(valid_chunks),
+                    max(15, self.MIN_SUMMARY_LENGTH // len(valid_chunks)),
+                    length
+                ))
+                owners.append(i)
+        
+        chunk_summaries = {i: [] for i in owners}
+        for i, chunk_summary in zip(owners, self._summarize_batch(jobs)):
             if chunk_summary:
-                chunk_summaries.append(chunk_summary)
+                chunk_summaries[i].append(chunk_summary)
+        
+        for i, parts in chunk_summaries.items():
+            summaries[i] = ' '.join(parts) if parts else "خلاصہ دستیاب نہیں"
+        
+        return summaries
+    
+    def summarize_text(self, text):
+        """Generate summary with robust error handling"""
+        return self.summarize_texts([text])[0]
+    
+    def _process_batch(self, batch):
+        """Classify and summarize a batch of (filepath, text) pairs"""
+        texts = [text for _, text in batch]
+        categories = self.classify_texts(texts)
+        summaries = self.summarize_texts(texts)
         
-        if not chunk_summaries:
-            return "خلاصہ دستیاب نہیں"
+        return [{
+            'file_name': os.path.basename(filepath),
+            'file_path': os.path.relpath(filepath, self.articles_path),
+            'category_urdu': category,
+            'category_english': self.CATEGORY_MAP.get(category, 'other'),
+            'summary': summary,
+            'text_length': len(text),
+            'text_sample': text[:100] + '...' if len(text) > 100 else text
+        } for (filepath, text), category, summary in zip(batch, categories, summaries)]
+    
+    def _iter_text_files(self, path):
+        """Yield .txt file paths under path, recursing with os.scandir"""
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_text_files(entry.path)
+                elif entry.name.endswith('.txt') and entry.is_file():
+                    yield entry.path
+    
+    def _read_text(self, filepath):
+        """Read a whole text file, or return None if unreadable or empty"""
+        filename = os.path.basename(filepath)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        except Exception as e:
+            print(f"Error processing {filename}: {str(e)[:100]}...")
+            return None
         
-        return ' '.join(chunk_summaries)
+        if not text:
+            print(f"Skipping empty file: {filename}")
+            return None
+        return text
+    
+    def _process_paths(self, filepaths):
+        """Read, classify and summarize one batch of files"""
+        batch = []
+        for filepath in filepaths:
+            text = self._read_text(filepath)
+            if text:
+                batch.append((filepath, text))
+        
+        if not batch:
+            return []
+        try:
+            return self._process_batch(batch)
+        except Exception as e:
+            print(f"Error processing batch ending at {os.path.basename(batch[-1][0])}: {str(e)[:100]}...")
+            return []
     
     def process_files(self):
-        """Process all text files in the directory with progress tracking"""
+        """Process all text files in the directory with progress tracking
+        
+        Models are loaded on demand: by each worker when a process pool is
+        used, otherwise (or if the pool fails) in this process. Models the
+        caller already loaded are left in place and reused in-process.
+        """
         results = []
         
         if not os.path.exists(self.articles_path):
             print(f"Directory not found: {self.articles_path}")
             print(f"Please create the folder and add Urdu text files")
-            return pd.DataFrame()
-        
-        processed_files = 0
-        for root, _, files in os.walk(self.articles_path):
-            for filename in files:
-                if filename.endswith('.txt'):
-                    filepath = os.path.join(root, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            text = f.read().strip()
-                        
-                        if not text:
-                            print(f"Skipping empty file: {filename}")
-                            continue
-                        
-                        category = self.classify_text(text)
-                        summary = self.summarize_text(text)
-                        
-                        results.append({
-                            'file_name': filename,
-                            'file_path': os.path.relpath(filepath, self.articles_path),
-                            'category_urdu': category,
-                            'category_english': self.CATEGORY_MAP.get(category, 'other'),
-                            'summary': summary,
-                            'text_length': len(text),
-                            'text_sample': text[:100] + '...' if len(text) > 100 else text
-                        })
-                        
-                        processed_files += 1
-                        if processed_files % 5 == 0:
-                            print(f"Processed {processed_files} files... Current file: {filename}")
-                            
-                    except Exception as e:
-                        print(f"Error processing {filename}: {str(e)[:100]}...")
-        
-        return pd.DataFrame(results)
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        
+        filepaths = list(self._iter_text_files(self.articles_path))
+        batches = [filepaths[i:i + self.FILE_BATCH_SIZE]
+                   for i in range(0, len(filepaths), self.FILE_BATCH_SIZE)]
+        
+        done_batches = 0
+        
+        def collect(batch_results):
+            nonlocal done_batches
+            for batch, batch_result in zip(batches[done_batches:], batch_results):
+                results.extend(batch_result)
+                done_batches += 1
+                print(f"Processed {len(results)} files... Current file: {os.path.basename(batch[-1])}")
+        
+        if self.NUM_WORKERS > 1 and len(batches) > 1:
+            settings = {key: value for key, value in vars(self).items()
+                        if key not in ('classifier', 'summarizer', 'tokenizer')}
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.NUM_WORKERS, len(batches)),
+                    initializer=_worker_init,
+                    initargs=(settings,)
+                ) as executor:
+                    collect(executor.map(_process_paths_in_worker, batches))
+            except BrokenProcessPool as e:
+                print(f"Worker processes failed ({e}); processing remaining files in this process")
+        
+        if done_batches < len(batches):
+            if self.classifier is None and not self.initialize_models():
+                print("Failed to initialize models. Skipping remaining files...")
+            else:
+                collect(map(self._process_paths, batches[done_batches:]))
+        
+        df = pd.DataFrame.from_records(results, columns=RESULT_COLUMNS)
+        df[CATEGORY_COLUMNS] = df[CATEGORY_COLUMNS].astype('category')
+        return df
+
+# Per-process state for process_files workers
+_worker_processor = None
+
+def _worker_init(settings):
+    """Load one model replica in a worker process"""
+    global _worker_processor
+    torch.set_num_threads(1)  # Workers already fill the cores; avoid oversubscription
+    _worker_processor = UrduLLMProcessor()
+    vars(_worker_processor).update(settings)
+    if not _worker_processor.initialize_models():
+        raise RuntimeError("Failed to initialize models in worker process")
+
+def _process_paths_in_worker(filepaths):
+    return _worker_processor._process_paths(filepaths)
 
 if __name__ == "__main__":
     processor = UrduLLMProcessor()
     
-    if not processor.initialize_models():
-        print("Failed to initialize models. Exiting...")
-        exit()
-    
+    # Models are loaded by process_files, in the workers or in this process
     print(f"\nProcessing files in: {processor.articles_path}")
     results = processor.process_files()
     
     if not results.empty:
-        results.to_csv(processor.output_file, index=False, encoding='utf-8-sig')
+        with open(processor.output_file, 'w', newline='', encoding='utf-8-sig',
+                  buffering=CSV_BUFFER_SIZE) as f:
+            results.to_csv(f, index=False)
         print(f"\nSuccessfully processed {len(results)} files")
         print(f"Results saved to {processor.output_file}")
         print("\nSample results:")
@@ -1,12 +1,15 @@
 import os
+import importlib.util
+from itertools import chain
 from pathlib import Path
-from datasets import Dataset
+from datasets import Dataset, load_dataset
 from transformers import (
     AutoTokenizer,
     AutoModelForCausalLM,
     TrainingArguments,
     Trainer,
-    DataCollatorForLanguageModeling
+    DataCollatorForLanguageModeling,
+    default_data_collator
 )
 import torch
 
@@ -14,10 +17,41 @@ import torch
 DATA_DIR = r"C:\a_llm\urdu_article\ncpul_articles_archive"
 MODEL_NAME = "urdu-llm"
 PRETRAINED_MODEL = "facebook/opt-350m"  # No authentication needed
-BLOCK_SIZE = 256
+BLOCK_SIZE = 256  # Multiple of 8 so attention matmuls map onto Tensor Cores
 BATCH_SIZE = 4
 LEARNING_RATE = 5e-5
 EPOCHS = 3
+# True: pack all articles into contiguous BLOCK_SIZE blocks.
+# False: one truncated sequence per article (keeps article boundaries), batched by similar length.
+PACK_SEQUENCES = True
+
+# LoRA fine-tuning: train small low-rank adapters on the attention projections
+# instead of all base weights (requires peft); adapters are merged before saving
+USE_LORA = True
+LORA_RANK = 16
+LORA_ALPHA = 32
+LORA_DROPOUT = 0.05
+LORA_TARGET_MODULES = ["q_proj", "v_proj"]  # OPT attention query/value projections
+
+# Multi-GPU settings (launch with: torchrun --nproc_per_node=N llm2.py)
+GRADIENT_ACCUMULATION_STEPS = 8  # Trainer skips gradient AllReduce on non-final micro-steps
+DATALOADER_WORKERS = 4
+DDP_BUCKET_CAP_MB = 25
+LOAD_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Tokenized/packed datasets are kept here as memory-mapped Arrow files and reused across runs
+TOKENIZED_CACHE_DIR = Path(DATA_DIR).parent / "tokenized_cache"
+# Articles per tokenizer call; the Rust tokenizer spreads each batch over all cores itself
+TOKENIZE_BATCH_SIZE = 10_000
+EMBEDDING_PAD_MULTIPLE = 64  # Pad the vocab so the embedding/LM-head matmuls are Tensor Core aligned
+# Fused attention kernels: FlashAttention-2 when flash-attn is installed on an Ampere+ GPU
+# (it has no kernels for older architectures), PyTorch SDPA otherwise
+ATTN_IMPLEMENTATION = (
+    "flash_attention_2"
+    if torch.cuda.is_available()
+    and torch.cuda.get_device_capability()[0] >= 8
+    and importlib.util.find_spec("flash_attn") is not None
+    else "sdpa"
+)
 
 def setup_environment():
     """Configure environment settings"""
@@ -36,81 +70,180 @@ def setup_environment():
                 print("Continuing with local operations only")
 
 def load_urdu_articles():
-    """Load all Urdu articles from text files"""
-    urdu_texts = []
-    for root, _, files in os.walk(DATA_DIR):
-        for file in files:
-            if file.endswith('.txt'):
-                filepath = os.path.join(root, file)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        # Clean content as needed
-                        urdu_texts.append(content)
-                except Exception as e:
-                    print(f"Error reading {filepath}: {e}")
+    """Load all Urdu articles from text files
     
-    print(f"Loaded {len(urdu_texts)} Urdu articles")
-    return Dataset.from_dict({"text": urdu_texts})
+    Files are read by the datasets text loader (one row per file) in
+    parallel and written to memory-mapped Arrow shards instead of being
+    held in a Python list.
+    """
+    files = [str(path) for path in Path(DATA_DIR).rglob("*.txt")]
+    if not files:
+        print(f"No .txt files found in {DATA_DIR}")
+        return Dataset.from_dict({"text": []})
+    
+    dataset = load_dataset(
+        "text",
+        data_files=files,
+        sample_by="document",
+        encoding_errors="replace",
+        num_proc=min(LOAD_WORKERS, len(files)),
+        keep_in_memory=False,
+        split="train",
+    )
+    
+    print(f"Loaded {len(dataset)} Urdu articles")
+    return dataset
+
+def group_texts(examples):
+    """Concatenate tokenized articles and split them into BLOCK_SIZE chunks
+    
+    The remainder shorter than BLOCK_SIZE is dropped, so every block has the
+    same length and needs no padding.
+    """
+    concatenated = {key: list(chain.from_iterable(values)) for key, values in examples.items()}
+    total_length = (len(concatenated["input_ids"]) // BLOCK_SIZE) * BLOCK_SIZE
+    result = {
+        key: [tokens[i:i + BLOCK_SIZE] for i in range(0, total_length, BLOCK_SIZE)]
+        for key, tokens in concatenated.items()
+    }
+    result["labels"] = result["input_ids"].copy()
+    return result
 
 def main():
     # Setup environment (without mandatory login)
     setup_environment()
     
-    # Load and prepare data
-    print("Loading Urdu articles...")
-    dataset = load_urdu_articles()
+    # torchrun sets LOCAL_RANK per process; Trainer places the model on that device
+    use_cuda = torch.cuda.is_available()
+    # bf16 on Ampere+ (no loss scaling needed), fp16 with loss scaling on older GPUs
+    use_bf16 = use_cuda and torch.cuda.is_bf16_supported()
+    use_tf32 = use_cuda and torch.cuda.get_device_capability()[0] >= 8
+    local_rank = int(os.environ.get("LOCAL_RANK", -1))
+    if use_cuda and local_rank >= 0:
+        torch.cuda.set_device(local_rank)
     
     # Initialize tokenizer and model
     print("Initializing model...")
-    tokenizer = AutoTokenizer.from_pretrained(PRETRAINED_MODEL)
+    tokenizer = AutoTokenizer.from_pretrained(PRETRAINED_MODEL, use_fast=True)
     if tokenizer.pad_token is None:
         tokenizer.add_special_tokens({'pad_token': '[PAD]'})
     
-    model = AutoModelForCausalLM.from_pretrained(PRETRAINED_MODEL)
-    model.resize_token_embeddings(len(tokenizer))
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model.to(device)
+    # Weights stay fp32 for mixed-precision training; attention runs in the autocast dtype
+    model = AutoModelForCausalLM.from_pretrained(PRETRAINED_MODEL, attn_implementation=ATTN_IMPLEMENTATION)
+    model.resize_token_embeddings(len(tokenizer), pad_to_multiple_of=EMBEDDING_PAD_MULTIPLE)
+    if USE_LORA:
+        from peft import LoraConfig, get_peft_model
+        lora_config = LoraConfig(
+            r=LORA_RANK,
+            lora_alpha=LORA_ALPHA,
+            target_modules=LORA_TARGET_MODULES,
+            lora_dropout=LORA_DROPOUT,
+            bias="none",
+            task_type="CAUSAL_LM"
+        )
+        model = get_peft_model(model, lora_config)
+        model.print_trainable_parameters()
     
-    # Tokenize dataset
-    print("Preparing dataset...")
     def tokenize_function(examples):
-        return tokenizer(examples["text"], truncation=True, max_length=BLOCK_SIZE)
-    
-    tokenized_dataset = dataset.map(
-        tokenize_function,
-        batched=True,
-        remove_columns=["text"],
-        num_proc=4
-    )
+        if PACK_SEQUENCES:
+            # No truncation: whole articles are packed into blocks below
+            return tokenizer(examples["text"])
+        tokenized = tokenizer(examples["text"], truncation=True, max_length=BLOCK_SIZE)
+        tokenized["length"] = [len(ids) for ids in tokenized["input_ids"]]
+        return tokenized
     
-    # Train model
-    print("Starting training...")
     training_args = TrainingArguments(
         output_dir=MODEL_NAME,
         overwrite_output_dir=True,
         num_train_epochs=EPOCHS,
         per_device_train_batch_size=BATCH_SIZE,
+        gradient_accumulation_steps=GRADIENT_ACCUMULATION_STEPS,
         save_steps=10_000,
         save_total_limit=2,
         logging_dir='./logs',
         logging_steps=500,
         learning_rate=LEARNING_RATE,
-        fp16=device == "cuda",
+        group_by_length=not PACK_SEQUENCES,  # Batch similar lengths together to minimise padding
+        length_column_name="length",
+        bf16=use_bf16,
+        fp16=use_cuda and not use_bf16,
+        tf32=True if use_tf32 else None,
+        dataloader_num_workers=DATALOADER_WORKERS,
+        dataloader_pin_memory=use_cuda,
+        ddp_backend=("nccl" if use_cuda else "gloo") if local_rank >= 0 else None,
+        ddp_find_unused_parameters=False,
+        ddp_bucket_cap_mb=DDP_BUCKET_CAP_MB,
+        ddp_broadcast_buffers=False,
+        # Frozen base weights make recomputing activations cheap relative to the memory saved
+        gradient_checkpointing=USE_LORA,
+        gradient_checkpointing_kwargs={"use_reentrant": False},
     )
     
+    # Under torchrun, rank 0 loads and tokenizes first; the other ranks then
+    # reuse its Arrow cache files instead of rebuilding them concurrently
+    with training_args.main_process_first(desc="dataset prep"):
+        # Load and prepare data
+        print("Loading Urdu articles...")
+        dataset = load_urdu_articles()
+        
+        # Tokenize dataset
+        print("Preparing dataset...")
+        # Cache names include everything that changes the output; the dataset
+        # fingerprint follows the article files (paths and modification times)
+        TOKENIZED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_prefix = "{}_{}_{}_{}".format(
+            PRETRAINED_MODEL.replace("/", "_"),
+            "packed" if PACK_SEQUENCES else "truncated",
+            BLOCK_SIZE,
+            dataset._fingerprint
+        )
+        
+        # Single process on purpose: tokenizers disables its own thread pool in forked
+        # map workers, while one large batch runs encode_batch across every core
+        tokenized_dataset = dataset.map(
+            tokenize_function,
+            batched=True,
+            batch_size=TOKENIZE_BATCH_SIZE,
+            remove_columns=["text"],
+            cache_file_name=str(TOKENIZED_CACHE_DIR / f"{cache_prefix}_tokens.arrow"),
+            load_from_cache_file=True
+        )
+        if PACK_SEQUENCES:
+            tokenized_dataset = tokenized_dataset.map(
+                group_texts,
+                batched=True,
+                batch_size=1000,
+                num_proc=4,
+                cache_file_name=str(TOKENIZED_CACHE_DIR / f"{cache_prefix}_blocks.arrow"),
+                load_from_cache_file=True
+            )
+    
+    if PACK_SEQUENCES:
+        data_collator = default_data_collator
+    else:
+        # Pads each batch to its longest sequence, rounded up for Tensor Cores
+        data_collator = DataCollatorForLanguageModeling(
+            tokenizer=tokenizer,
+            mlm=False,
+            pad_to_multiple_of=8
+        )
+    
+    # Train model
+    print("Starting training...")
     trainer = Trainer(
         model=model,
         args=training_args,
         train_dataset=tokenized_dataset,
-        data_collator=DataCollatorForLanguageModeling(
-            tokenizer=tokenizer,
-            mlm=False
-        ),
+        data_collator=data_collator,
     )
     
     trainer.train()
-    trainer.save_model(MODEL_NAME)
+    if USE_LORA:
+        # Fold the adapters into the base weights so test_llm2.py loads a plain model
+        if trainer.is_world_process_zero():
+            trainer.model.merge_and_unload().save_pretrained(MODEL_NAME)
+    else:
+        trainer.save_model(MODEL_NAME)
     tokenizer.save_pretrained(MODEL_NAME)
     print(f"Training complete! Model saved to {MODEL_NAME}")
 
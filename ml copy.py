@@ -1,10 +1,13 @@
 import os
 import re
+import codecs
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import make_pipeline
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pcsv
 
 class UrduTextClassifier:
     def __init__(self):
@@ -82,12 +85,12 @@ class UrduTextClassifier:
         self.model.fit(X, y)
     
     def process_files(self):
-        """Process all text files in the specified path"""
+        """Process all text files in the specified path and return one dict per file"""
         results = []
         
         if not os.path.exists(self.articles_path):
             print(f"Folder not found: {self.articles_path}")
-            return pd.DataFrame()
+            return []
         
         for root, _, files in os.walk(self.articles_path):
             for filename in files:
@@ -112,7 +115,7 @@ class UrduTextClassifier:
                         results.append({
                             'file_path': rel_path,
                             'category_urdu': predicted_urdu,
-                            'category_english': predicted_en,
+                            'category_english': str(predicted_en),
                             'summary': summary,
                             'text_length': len(text),
                             'text_sample': text[:100] + '...'
@@ -120,7 +123,13 @@ class UrduTextClassifier:
                     except Exception as e:
                         print(f"Error processing {filename}: {str(e)}")
         
-        return pd.DataFrame(results)
+        return results
+
+def save_results_csv(results, output_file):
+    """Write result rows to CSV with pyarrow's C++ writer (BOM first so Excel reads Urdu)"""
+    with open(output_file, 'wb') as f:
+        f.write(codecs.BOM_UTF8)
+        pcsv.write_csv(pa.Table.from_pylist(results), f)
 
 # Example Usage
 if __name__ == "__main__":
@@ -148,12 +157,12 @@ if __name__ == "__main__":
     results = classifier.process_files()
     
     # Save and display results
-    if not results.empty:
+    if results:
         output_file = 'urdu_articles_classified.csv'
-        results.to_csv(output_file, index=False, encoding='utf-8-sig')
+        save_results_csv(results, output_file)
         print(f"\nResults saved to {output_file}")
         print("\nSample output:")
-        print(results[['file_path', 'category_urdu', 'summary']].head())
+        print(pd.DataFrame(results[:5])[['file_path', 'category_urdu', 'summary']])
     else:
         print("\nNo files processed. Please check:")
         print(f"1. Folder exists: {classifier.articles_path}")
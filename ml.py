@@ -1,10 +1,22 @@
 import os
 import re
+import codecs
+from pathlib import Path
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import normalize
+from scipy.sparse import csr_matrix
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pcsv
+from concurrent.futures import ProcessPoolExecutor
+
+# Runs of word characters / Arabic-script letters; everything else separates words
+_WORD_RE = re.compile(r'[\w\u0600-\u06FF]+')
+# Sentence ends: full stop, exclamation mark or Urdu question mark
+_SENT_RE = re.compile(r'[.!؟]+\s*')
 
 class UrduTextClassifier:
     def __init__(self):
@@ -21,32 +33,47 @@ class UrduTextClassifier:
         }
         
         # Urdu stopwords
-        self.STOPWORDS = set([
+        self.STOPWORDS = frozenset([
             'اور', 'ہے', 'کی', 'ہےں', 'ہوں', 'سے', 'کو', 'میں', 'کے', 'لیے',
             'ہیں', 'تھا', 'تھی', 'تھے', 'کر', 'گی', 'گا', 'گے', 'نے', 'یہ',
             'اس', 'وہ', 'آپ', 'کہ', 'یا', 'تو', 'پر', 'بھی', 'ہی', 'ہو'
         ])
         
-        # Initialize classifier
+        # Initialize classifier (vectorizers drop stopwords from the tokenizer's output)
         self.model = make_pipeline(
-            TfidfVectorizer(tokenizer=self.tokenize_urdu),
+            TfidfVectorizer(
+                tokenizer=self.tokenize_urdu,
+                stop_words=sorted(self.STOPWORDS),
+                token_pattern=None
+            ),
             MultinomialNB()
         )
         
+        # Stateless sentence vectorizer shared by all summaries (raw term counts)
+        self._sentence_vectorizer = HashingVectorizer(
+            tokenizer=self.tokenize_urdu,
+            stop_words=sorted(self.STOPWORDS),
+            token_pattern=None,
+            n_features=2 ** 18,
+            alternate_sign=False,
+            norm=None
+        )
+        
         # Set the specific path
         self.articles_path = r'C:\a_llm\urdu_article\ncpul_articles_archive'
+        
+        # Summaries are CPU-bound and independent, so they run in worker processes
+        self.NUM_WORKERS = os.cpu_count() or 1
+        self.SUMMARY_CHUNK_SIZE = 32  # Articles sent to a worker per task
     
     def tokenize_urdu(self, text):
-        """Basic Urdu tokenizer without external dependencies"""
-        text = re.sub(r'[^\w\u0600-\u06FF\s]', ' ', text)
-        words = re.findall(r'[\w\u0600-\u06FF]+', text)
-        return [word for word in words if word not in self.STOPWORDS]
+        """Basic Urdu tokenizer without external dependencies (stopwords are kept)"""
+        return _WORD_RE.findall(text)
     
     def extract_summary(self, text, num_sentences=3):
         """Extract key sentences as summary using TF-IDF approach"""
         # Simple Urdu sentence splitting
-        sentences = re.split(r'[.!؟]+\s*', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = [s for s in map(str.strip, _SENT_RE.split(text)) if s]
         
         if len(sentences) <= num_sentences:
             return text
@@ -54,24 +81,26 @@ class UrduTextClassifier:
         # Preprocess each sentence
         preprocessed = [self.preprocess_text(sent) for sent in sentences]
         
-        # Create TF-IDF matrix
-        vectorizer = TfidfVectorizer(tokenizer=self.tokenize_urdu)
-        sentence_vectors = vectorizer.fit_transform(preprocessed)
+        # Create TF-IDF matrix: hashed counts weighted by this document's IDF
+        counts = self._sentence_vectorizer.transform(preprocessed)
+        _, term_ids, doc_freq = np.unique(counts.indices, return_inverse=True, return_counts=True)
+        idf = np.log((1 + len(sentences)) / (1 + doc_freq)) + 1
+        sentence_vectors = normalize(
+            csr_matrix((counts.data * idf[term_ids], counts.indices, counts.indptr), shape=counts.shape)
+        )
         
         # Calculate sentence importance scores
-        scores = np.array(sentence_vectors.sum(axis=1)).flatten()
+        scores = np.asarray(sentence_vectors.sum(axis=1)).ravel()
         
-        # Rank sentences and pick top ones
-        ranked_indices = np.argsort(-scores)
-        top_indices = sorted(ranked_indices[:num_sentences])
+        # Pick top sentences without fully sorting the scores
+        top_indices = sorted(np.argpartition(-scores, num_sentences)[:num_sentences])
         
         # Return summary in original order
         return ' '.join([sentences[i] for i in top_indices])
     
     def preprocess_text(self, text):
         """Text preprocessing for classification"""
-        text = re.sub(r'[^\w\u0600-\u06FF\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Tokenizing already drops punctuation and whitespace runs
         return ' '.join(self.tokenize_urdu(text))
     
     def train_classifier(self, labeled_data):
@@ -82,45 +111,65 @@ class UrduTextClassifier:
         self.model.fit(X, y)
     
     def process_files(self):
-        """Process all text files in the specified path"""
-        results = []
-        
+        """Process all text files in the specified path and return one dict per file"""
         if not os.path.exists(self.articles_path):
             print(f"Folder not found: {self.articles_path}")
-            return pd.DataFrame()
+            return []
+        
+        # Read every article first so the classifier runs once over all of them
+        items = []
+        for filepath in Path(self.articles_path).rglob('*.txt'):
+            try:
+                text = filepath.read_text(encoding='utf-8', errors='replace')
+                rel_path = os.path.relpath(filepath, self.articles_path)
+                items.append((rel_path, text))
+            except Exception as e:
+                print(f"Error processing {filepath.name}: {str(e)}")
         
-        for root, _, files in os.walk(self.articles_path):
-            for filename in files:
-                if filename.endswith('.txt'):
-                    filepath = os.path.join(root, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            text = f.read()
-                        
-                        # Extract summary
-                        summary = self.extract_summary(text)
-                        
-                        # Predict category
-                        predicted_en = self.model.predict([text])[0]
-                        predicted_urdu = next(
-                            (k for k, v in self.CATEGORIES.items() if v == predicted_en),
-                            'دیگر'
-                        )
-                        
-                        rel_path = os.path.relpath(filepath, self.articles_path)
-                        
-                        results.append({
-                            'file_path': rel_path,
-                            'category_urdu': predicted_urdu,
-                            'category_english': predicted_en,
-                            'summary': summary,
-                            'text_length': len(text),
-                            'text_sample': text[:100] + '...'
-                        })
-                    except Exception as e:
-                        print(f"Error processing {filename}: {str(e)}")
+        if not items:
+            return []
+        texts = [text for _, text in items]
         
-        return pd.DataFrame(results)
+        # Extract summaries
+        if self.NUM_WORKERS > 1 and len(texts) > self.SUMMARY_CHUNK_SIZE:
+            with ProcessPoolExecutor(
+                max_workers=self.NUM_WORKERS,
+                initializer=_worker_init,
+                initargs=(self,)
+            ) as executor:
+                summaries = list(executor.map(_summarize_in_worker, texts, chunksize=self.SUMMARY_CHUNK_SIZE))
+        else:
+            summaries = [self.extract_summary(text) for text in texts]
+        
+        # Predict categories in one batch
+        predictions = self.model.predict(texts)
+        urdu_names = {v: k for k, v in self.CATEGORIES.items()}
+        
+        return [{
+            'file_path': rel_path,
+            'category_urdu': urdu_names.get(predicted_en, 'دیگر'),
+            'category_english': str(predicted_en),
+            'summary': summary,
+            'text_length': len(text),
+            'text_sample': text[:100] + '...'
+        } for (rel_path, text), summary, predicted_en in zip(items, summaries, predictions)]
+
+# Per-process state for process_files workers
+_worker_classifier = None
+
+def _worker_init(classifier):
+    """Keep one copy of the classifier in each worker process"""
+    global _worker_classifier
+    _worker_classifier = classifier
+
+def _summarize_in_worker(text):
+    return _worker_classifier.extract_summary(text)
+
+def save_results_csv(results, output_file):
+    """Write result rows to CSV with pyarrow's C++ writer (BOM first so Excel reads Urdu)"""
+    with open(output_file, 'wb') as f:
+        f.write(codecs.BOM_UTF8)
+        pcsv.write_csv(pa.Table.from_pylist(results), f)
 
 # Example Usage
 if __name__ == "__main__":
@@ -148,12 +197,12 @@ if __name__ == "__main__":
     results = classifier.process_files()
     
     # Save and display results
-    if not results.empty:
+    if results:
         output_file = 'urdu_articles_classified.csv'
-        results.to_csv(output_file, index=False, encoding='utf-8-sig')
+        save_results_csv(results, output_file)
         print(f"\nResults saved to {output_file}")
         print("\nSample output:")
-        print(results[['file_path', 'category_urdu', 'summary']].head())
+        print(pd.DataFrame(results[:5])[['file_path', 'category_urdu', 'summary']])
     else:
         print("\nNo files processed. Please check:")
         print(f"1. Folder exists: {classifier.articles_path}")
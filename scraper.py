@@ -1,34 +1,127 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+import lxml.html
+from lxml import etree
 from urllib.parse import urljoin, urlparse
-import time
 from datetime import datetime
 import csv
 import re
+import queue
+import threading
+import itertools
+from functools import lru_cache
+from dateutil import parser as date_parser
+from http_client import fetch_page, close_session
 
 # Configure settings
 BASE_URL = "https://ncpulblog.blogspot.com/"
 OUTPUT_ROOT = "ncpul_articles_archive"
-DELAY_BETWEEN_REQUESTS = 2  # seconds
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Pages are parsed once with lxml and queried with compiled XPaths
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+def _class_xpath(path, cls):
+    """XPath for elements whose class list contains cls (so "post hentry" matches)"""
+    return f"{path}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+POST_XPATH = etree.XPath(_class_xpath('//div', 'post'))
+OLDER_LINK_XPATH = etree.XPath(_class_xpath('//a', 'blog-pager-older-link') + '/@href')
+LINK_HREF_XPATH = etree.XPath('//a/@href')
+TITLE_XPATH = etree.XPath(_class_xpath('.//h3', 'post-title') + ' | ' + _class_xpath('.//h1', 'post-title'))
+TITLE_LINK_XPATH = etree.XPath('.//a/@href')
+DATE_XPATH = etree.XPath(_class_xpath('.//span', 'post-timestamp') + ' | ' + _class_xpath('.//span', 'date-header'))
+AUTHOR_XPATH = etree.XPath(_class_xpath('.//span', 'post-author') + ' | ' + _class_xpath('.//span', 'author'))
+CONTENT_XPATH = etree.XPath(_class_xpath('.//div', 'post-body'))
+TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+
+# Anything other than word characters, space, dot, underscore or hyphen
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w .\-]')
+CSV_BUFFER_SIZE = 1 << 20  # Metadata CSV write buffer
+CSV_FIELDNAMES = ['title', 'date', 'author', 'url', 'file_path', 'year', 'month']
+BLOG_POST_URL = re.compile(r'.*/\d{4}/\d{2}/blog-post.*\.html$')
+
+# Article files are written by a single background thread
+_write_queue = queue.Queue()
+_writer_thread = None
+
+def _writer_loop(q):
+    """Write queued (filepath, bytes) items until a None sentinel arrives"""
+    while True:
+        item = q.get()
+        try:
+            if item is None:
+                break
+            filepath, payload = item
+            with open(filepath, 'wb') as f:
+                f.write(payload)
+        except OSError as e:
+            print(f"Error writing {item[0]}: {e}")
+        finally:
+            q.task_done()
+
+def start_writer():
+    """Start the background file writer if it isn't running"""
+    global _writer_thread
+    if _writer_thread is None or not _writer_thread.is_alive():
+        _writer_thread = threading.Thread(target=_writer_loop, args=(_write_queue,), daemon=True)
+        _writer_thread.start()
+
+def stop_writer():
+    """Wait for queued article writes to finish and stop the writer"""
+    global _writer_thread
+    if _writer_thread is not None:
+        _write_queue.put(None)
+        _writer_thread.join()
+        _writer_thread = None
+
+# Folders already created during this run
+_created_dirs = set()
+
+def ensure_dir(path):
+    """Create a folder once per run, skipping the filesystem on repeat calls"""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
 def setup_folders(base_path):
     """Create necessary folders for output"""
-    if not os.path.exists(base_path):
-        os.makedirs(base_path)
+    ensure_dir(base_path)
     return base_path
 
 def sanitize_filename(title):
     """Create a safe filename from article title"""
-    keep_chars = (' ', '.', '_', '-')
-    return "".join(c if c.isalnum() or c in keep_chars else "_" for c in title).strip()
+    return UNSAFE_FILENAME_CHARS.sub('_', title).strip()
+
+@lru_cache(maxsize=4096)
+def parse_article_date(date_str):
+    """Parse a post timestamp, or return None unless it holds a full date"""
+    # Parse against two different defaults: a field that changes with the
+    # default was missing from the string (e.g. a bare time of day)
+    try:
+        first = date_parser.parse(date_str, fuzzy=True, default=datetime(2000, 1, 1))
+        second = date_parser.parse(date_str, fuzzy=True, default=datetime(2001, 2, 2))
+    except (ValueError, OverflowError):
+        return None
+    if first.date() != second.date():
+        return None
+    return first
 
 def is_blog_post_url(url):
     """Check if URL is a blog post URL"""
-    return re.match(r'.*/\d{4}/\d{2}/blog-post.*\.html$', url)
+    return BLOG_POST_URL.match(url)
+
+def _node_text(node):
+    """Whitespace-joined text of an element, skipping script and style"""
+    return ' '.join(t.strip() for t in TEXT_XPATH(node) if t.strip())
+
+def _first(xpath, node):
+    """First match of a compiled XPath under node, or None"""
+    matches = xpath(node)
+    return matches[0] if matches else None
 
 def extract_article_data(article_div, url=None):
     """Extract relevant data from article HTML"""
@@ -43,27 +136,27 @@ def extract_article_data(article_div, url=None):
             data['month'] = path_parts[2]
     
     # Title and URL
-    title_tag = article_div.find('h3', class_='post-title') or article_div.find('h1', class_='post-title')
-    if title_tag:
-        data['title'] = title_tag.get_text(strip=True)
-        link = title_tag.find('a')
+    title_tag = _first(TITLE_XPATH, article_div)
+    if title_tag is not None:
+        data['title'] = _node_text(title_tag)
+        link = _first(TITLE_LINK_XPATH, title_tag)
         if link and 'url' not in data:  # Only set URL if not already set from parameter
-            data['url'] = link['href']
+            data['url'] = str(link)
     
     # Date
-    date_tag = article_div.find('span', class_='post-timestamp') or article_div.find('span', class_='date-header')
-    if date_tag:
-        data['date'] = date_tag.get_text(strip=True)
+    date_tag = _first(DATE_XPATH, article_div)
+    if date_tag is not None:
+        data['date'] = _node_text(date_tag)
     
     # Author
-    author_tag = article_div.find('span', class_='post-author') or article_div.find('span', class_='author')
-    if author_tag:
-        data['author'] = author_tag.get_text(strip=True)
+    author_tag = _first(AUTHOR_XPATH, article_div)
+    if author_tag is not None:
+        data['author'] = _node_text(author_tag)
     
     # Content
-    content_div = article_div.find('div', class_='post-body') or article_div.find('div', class_='post-body entry-content')
-    if content_div:
-        data['content'] = content_div.get_text(strip=True)
+    content_div = _first(CONTENT_XPATH, article_div)
+    if content_div is not None:
+        data['content'] = _node_text(content_div)
     
     return data
 
@@ -86,9 +179,7 @@ def save_article(article_data, year=None, month=None):
     year_folder = os.path.join(OUTPUT_ROOT, str(year))
     month_folder = os.path.join(year_folder, f"{int(month):02d}")
     
-    for folder in [year_folder, month_folder]:
-        if not os.path.exists(folder):
-            os.makedirs(folder)
+    ensure_dir(month_folder)
     
     # Create filename
     safe_title = sanitize_filename(article_data['title'])
@@ -96,16 +187,9 @@ def save_article(article_data, year=None, month=None):
     
     # Try to extract date from article data
     if 'date' in article_data:
-        try:
-            # Try to parse different date formats
-            date_str = article_data['date']
-            if 'at' in date_str:
-                date_obj = datetime.strptime(date_str.split('at')[0].strip(), '%B %d, %Y')
-            else:
-                date_obj = datetime.strptime(date_str, '%B %d, %Y')
+        date_obj = parse_article_date(article_data['date'])
+        if date_obj:
             date_part = date_obj.strftime('%Y%m%d_')
-        except ValueError:
-            pass
     
     if not date_part:
         date_part = datetime.now().strftime('%Y%m%d_%H%M%S_')
@@ -113,46 +197,44 @@ def save_article(article_data, year=None, month=None):
     filename = f"{date_part}{safe_title[:50]}.txt"
     filepath = os.path.join(month_folder, filename)
     
-    # Write content to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(f"Title: {article_data['title']}\n\n")
-        if 'date' in article_data:
-            f.write(f"Published: {article_data['date']}\n")
-        if 'author' in article_data:
-            f.write(f"Author: {article_data['author']}\n")
-        if 'url' in article_data:
-            f.write(f"Original URL: {article_data['url']}\n")
-        f.write("\n" + "="*50 + "\n\n")
-        f.write(article_data['content'])
+    # Hand the encoded content to the writer thread
+    date_line = f"Published: {article_data['date']}\n" if 'date' in article_data else ""
+    author_line = f"Author: {article_data['author']}\n" if 'author' in article_data else ""
+    url_line = f"Original URL: {article_data['url']}\n" if 'url' in article_data else ""
+    body = (
+        f"Title: {article_data['title']}\n\n"
+        f"{date_line}{author_line}{url_line}"
+        f"\n{'=' * 50}\n\n"
+        f"{article_data['content']}"
+    )
+    
+    start_writer()
+    _write_queue.put((filepath, body.encode('utf-8')))
     
     return filepath
 
 def get_year_month_urls(start_year, end_year):
     """Generate month URLs for all 12 months from start_year to end_year"""
-    urls = []
-    
-    for year in range(start_year, end_year - 1, -1):  # From start_year down to end_year
-        for month in range(12, 0, -1):  # From December (12) to January (1)
-            # Blogspot URL format: /YYYY/MM/
-            month_url = urljoin(BASE_URL, f"{year}/{month}/")
-            urls.append((month_url, year, month))
-    
-    return urls
+    # Newest first: start_year down to end_year, December down to January.
+    # Blogspot URL format: /YYYY/MM/ (BASE_URL ends with a slash)
+    return [
+        (f"{BASE_URL}{year}/{month}/", year, month)
+        for year, month in itertools.product(range(start_year, end_year - 1, -1), range(12, 0, -1))
+    ]
 
-def scrape_blog_post(url):
+async def scrape_blog_post(url):
     """Scrape an individual blog post URL"""
     try:
         print(f"Scraping blog post: {url}")
         
         # Fetch page
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        html = await fetch_page(url, headers=HEADERS)
+        tree = lxml.html.document_fromstring(html, parser=HTML_PARSER)
         
         # Find article container
-        article_div = soup.find('div', class_='post') or soup.find('div', class_='post hentry')
+        article_div = _first(POST_XPATH, tree)
         
-        if article_div:
+        if article_div is not None:
             article_data = extract_article_data(article_div, url)
             if article_data.get('content'):
                 filepath = save_article(article_data)
@@ -168,13 +250,11 @@ def scrape_blog_post(url):
                         'month': article_data.get('month', '')
                     }
                     return csv_data
-        
-        time.sleep(DELAY_BETWEEN_REQUESTS)
     except Exception as e:
         print(f"Error scraping blog post {url}: {e}")
     return None
 
-def scrape_month(url, year, month):
+async def scrape_month(url, year, month):
     """Scrape all articles from a specific month page"""
     articles = []
     current_url = url
@@ -188,12 +268,11 @@ def scrape_month(url, year, month):
         
         try:
             # Fetch page
-            response = requests.get(current_url, headers=HEADERS)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            html = await fetch_page(current_url, headers=HEADERS)
+            tree = lxml.html.document_fromstring(html, parser=HTML_PARSER)
             
             # Find all articles
-            article_divs = soup.find_all('div', class_='post')
+            article_divs = POST_XPATH(tree)
             
             for article in article_divs:
                 article_data = extract_article_data(article)
@@ -212,21 +291,19 @@ def scrape_month(url, year, month):
                         }
                         articles.append(csv_data)
             
-            # Also look for individual blog post links in the page
-            for link in soup.find_all('a', href=True):
-                if is_blog_post_url(link['href']):
-                    blog_post_data = scrape_blog_post(link['href'])
-                    if blog_post_data:
-                        articles.append(blog_post_data)
+            # Also fetch individual blog post links in the page, concurrently
+            # (http_client bounds in-flight requests and the per-host rate)
+            post_links = [str(href) for href in LINK_HREF_XPATH(tree) if is_blog_post_url(href)]
+            for blog_post_data in await asyncio.gather(*[scrape_blog_post(link) for link in post_links]):
+                if blog_post_data:
+                    articles.append(blog_post_data)
             
             # Find next page (for paginated months)
-            next_link = soup.find('a', class_='blog-pager-older-link')
-            current_url = urljoin(current_url, next_link['href']) if next_link else None
+            next_href = _first(OLDER_LINK_XPATH, tree)
+            current_url = urljoin(current_url, next_href) if next_href else None
             page_count += 1
             
-            time.sleep(DELAY_BETWEEN_REQUESTS)
-            
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"  Request error: {e}")
             break
         except Exception as e:
@@ -235,23 +312,18 @@ def scrape_month(url, year, month):
     
     return articles
 
-def save_to_csv(articles, folder_path):
-    """Save metadata to CSV file"""
-    if not articles:
-        print("No articles to save to CSV")
-        return
-    
+def open_metadata_csv(folder_path):
+    """Open the metadata CSV for streaming writes and write its header"""
     csv_path = os.path.join(folder_path, 'articles_metadata.csv')
-    fieldnames = ['title', 'date', 'author', 'url', 'file_path', 'year', 'month']
-    
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(articles)
-    
-    print(f"\nSaved metadata for {len(articles)} articles to {csv_path}")
+    csvfile = open(csv_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+    writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
+    writer.writeheader()
+    return csvfile, writer
 
-def main():
+async def _scrape_month_with_key(index, url, year, month):
+    return index, year, month, await scrape_month(url, year, month)
+
+async def main_async():
     print("Starting NCPUL blog archive scraper...")
     
     # Setup folders
@@ -260,28 +332,51 @@ def main():
     # Generate URLs for all months from 2025 down to 2015
     month_urls = get_year_month_urls(2025, 2015)
     
-    all_articles = []
     total_articles = 0
+    sample_articles = []
+    csvfile, writer = open_metadata_csv(OUTPUT_ROOT)
     
-    for url, year, month in month_urls:
-        month_articles = scrape_month(url, year, month)
-        all_articles.extend(month_articles)
-        total_articles += len(month_articles)
-        print(f"  Found {len(month_articles)} articles for {year}-{month:02d}")
+    # Scrape all months concurrently; http_client rate limits each host.
+    # Rows are written newest month first, as soon as every earlier month is done;
+    # months that finish out of order wait in `pending` until their turn.
+    tasks = [asyncio.create_task(_scrape_month_with_key(index, url, year, month))
+             for index, (url, year, month) in enumerate(month_urls)]
+    pending = {}
+    next_index = 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            index, year, month, month_articles = await finished
+            print(f"  Found {len(month_articles)} articles for {year}-{month:02d}")
+            pending[index] = month_articles
+            while next_index in pending:
+                month_articles = pending.pop(next_index)
+                writer.writerows(month_articles)
+                total_articles += len(month_articles)
+                sample_articles.extend(month_articles[:3 - len(sample_articles)])
+                next_index += 1
+            csvfile.flush()
+    finally:
+        for task in tasks:
+            task.cancel()
+        csvfile.close()
+        await close_session()
+        stop_writer()
     
-    # Save combined CSV
-    save_to_csv(all_articles, OUTPUT_ROOT)
+    print(f"\nSaved metadata for {total_articles} articles to {csvfile.name}")
     
     print("\nScraping complete! Summary:")
     print(f"- Total months processed: {len(month_urls)}")
     print(f"- Total articles scraped: {total_articles}")
     print(f"- Output folder: {os.path.abspath(OUTPUT_ROOT)}")
     
-    if all_articles:
+    if sample_articles:
         print("\nSample articles:")
-        for article in all_articles[:3]:
+        for article in sample_articles:
             print(f"  - {article['title']} ({article.get('date', 'no date')})")
             print(f"    Saved to: {article['file_path']}")
 
+def main():
+    asyncio.run(main_async())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
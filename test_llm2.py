@@ -1,23 +1,59 @@
+import importlib.util
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
 from pathlib import Path
 
 # Configuration
 MODEL_PATH = "urdu-llm"  # Path to your trained model
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-MAX_LENGTH = 200  # Maximum length of generated text
+# Mixed precision for generation on GPU (bf16 where supported)
+AMP_DTYPE = torch.bfloat16 if DEVICE == "cuda" and torch.cuda.is_bf16_supported() else torch.float16
+MAX_NEW_TOKENS = 200  # Maximum number of tokens generated after the prompt
 TEMPERATURE = 0.7  # Controls randomness (lower = more predictable)
 TOP_K = 50  # Consider top K probable tokens
 TOP_P = 0.95  # Nucleus sampling probability
 REPETITION_PENALTY = 1.2  # Penalize repeated text
+# Fused attention kernels: FlashAttention-2 when flash-attn is installed on an Ampere+ GPU
+# (it has no kernels for older architectures), PyTorch SDPA otherwise
+ATTN_IMPLEMENTATION = (
+    "flash_attention_2"
+    if DEVICE == "cuda"
+    and torch.cuda.get_device_capability()[0] >= 8
+    and importlib.util.find_spec("flash_attn") is not None
+    else "sdpa"
+)
+# Load weights as 4-bit NF4 on GPU when bitsandbytes is installed (decode is weight-bandwidth bound)
+QUANTIZE_4BIT = DEVICE == "cuda" and importlib.util.find_spec("bitsandbytes") is not None
+# Compile the forward pass on GPU; with the static KV cache decoding replays CUDA graphs
+COMPILE_MODEL = DEVICE == "cuda"
 
 def load_model():
     """Load the trained Urdu LLM model and tokenizer"""
     print("Loading Urdu LLM model...")
     try:
         tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
-        model = AutoModelForCausalLM.from_pretrained(MODEL_PATH)
-        model.to(DEVICE)
+        if QUANTIZE_4BIT:
+            quant_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=AMP_DTYPE
+            )
+            # device_map places the quantized weights on the GPU
+            model = AutoModelForCausalLM.from_pretrained(
+                MODEL_PATH, quantization_config=quant_config, device_map="auto",
+                attn_implementation=ATTN_IMPLEMENTATION
+            )
+        else:
+            # Half-precision weights on GPU (FlashAttention-2 needs fp16/bf16)
+            model = AutoModelForCausalLM.from_pretrained(
+                MODEL_PATH,
+                torch_dtype=AMP_DTYPE if DEVICE == "cuda" else torch.float32,
+                attn_implementation=ATTN_IMPLEMENTATION
+            )
+            model.to(DEVICE)
+        model.eval()
+        if COMPILE_MODEL:
+            model.forward = torch.compile(model.forward, mode="reduce-overhead")
         print("Model loaded successfully!")
         return tokenizer, model
     except Exception as e:
@@ -28,10 +64,12 @@ def generate_text(prompt, model, tokenizer):
     """Generate Urdu text from prompt"""
     inputs = tokenizer(prompt, return_tensors="pt").to(DEVICE)
     
-    with torch.no_grad():
+    with torch.no_grad(), torch.autocast(device_type=DEVICE, dtype=AMP_DTYPE, enabled=DEVICE == "cuda"):
         outputs = model.generate(
             **inputs,
-            max_length=MAX_LENGTH,
+            max_new_tokens=MAX_NEW_TOKENS,
+            use_cache=True,
+            cache_implementation="static",
             num_return_sequences=1,
             temperature=TEMPERATURE,
             top_k=TOP_K,
@@ -106,6 +144,11 @@ def main():
         print("2. You have all required packages installed")
         return
     
+    # One throwaway generation so compilation happens before the first prompt
+    if COMPILE_MODEL:
+        print("Warming up model...")
+        generate_text("اردو", model, tokenizer)
+    
     # Run interactive test
     interactive_test(tokenizer, model)
     